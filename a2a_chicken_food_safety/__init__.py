@@ -10,6 +10,6 @@ __author__ = "User"
 __email__ = "user@example.com"
 
 from .server import app as server_app
-from .client import ChickenFoodSafetyClient
+from .client import ChickenFoodSafetyClient, AsyncChickenFoodSafetyClient
 
-__all__ = ["server_app", "ChickenFoodSafetyClient"]
+__all__ = ["server_app", "ChickenFoodSafetyClient", "AsyncChickenFoodSafetyClient"]
@@ -4,19 +4,44 @@ A2A Client for Chicken Food Safety Service
 Implements the standard Agent-to-Agent HTTPS protocol with JSON messaging
 """
 
+import asyncio
 import json
-import uuid
+import secrets
+import aiohttp
+import fastjsonschema
+import orjson
 import requests
-from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
 import sys
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .timestamps import iso_now
+
 logger = logging.getLogger(__name__)
 
-class ChickenFoodSafetyClient:
+# A2A response schema, compiled once into a straight-line validator
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "required": ["version", "id", "timestamp", "type", "payload"],
+    "properties": {
+        "type": {"const": "response"},
+        "payload": {
+            "type": "object",
+            "required": ["success"]
+        }
+    }
+}
+
+_validate_response = fastjsonschema.compile(RESPONSE_SCHEMA)
+
+# Most food items the server accepts in one batch request
+MAX_BATCH_SIZE = 1000
+
+class BaseA2AClient:
+    """Message building and validation shared by the sync and async clients"""
+
     def __init__(self, server_url="http://localhost:8080"):
         """Initialize the A2A client"""
         self.server_url = server_url.rstrip('/')
@@ -24,12 +49,9 @@ class ChickenFoodSafetyClient:
         self.client_name = "Chicken Food Safety Client"
         self.version = "1.0"
 
-    def create_a2a_request(self, food_item):
-        """Create a standard A2A JSON request message"""
-        return {
+        # Constant parts of every request message, built once per client
+        self._req_skeleton = {
             "version": "1.0",
-            "id": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
             "type": "request",
             "sender": {
                 "agent_id": self.client_id,
@@ -39,94 +61,199 @@ class ChickenFoodSafetyClient:
             "recipient": {
                 "agent_id": "chicken-food-safety-service",
                 "name": "Chicken Food Safety Service"
-            },
-            "payload": {
-                "service": "chicken_food_safety_check",
-                "food_item": food_item
             }
         }
 
+    def create_a2a_request(self, food_item):
+        """Create a standard A2A JSON request message"""
+        # Shallow copy: the constant sender/recipient subtrees are shared
+        msg = self._req_skeleton.copy()
+        msg["id"] = secrets.token_hex(16)
+        msg["timestamp"] = iso_now()
+        msg["payload"] = {
+            "service": "chicken_food_safety_check",
+            "food_item": food_item
+        }
+        return msg
+
+    def create_a2a_batch_request(self, food_items):
+        """Create an A2A request message checking several food items at once"""
+        msg = self._req_skeleton.copy()
+        msg["id"] = secrets.token_hex(16)
+        msg["timestamp"] = iso_now()
+        msg["payload"] = {
+            "service": "chicken_food_safety_batch_check",
+            "food_items": list(food_items)
+        }
+        return msg
+
+    def validate_a2a_response(self, response_msg, request_id):
+        """Validate A2A response message format"""
+        try:
+            _validate_response(response_msg)
+        except fastjsonschema.JsonSchemaException as e:
+            logger.error("Invalid A2A response: %s", e.message)
+            return False
+
+        if response_msg.get("correlation_id") != request_id:
+            logger.error("Correlation ID mismatch")
+            return False
+
+        return True
+
+    def extract_payload(self, response_msg, request_msg):
+        """Validate an A2A response and unpack its (payload, error) pair"""
+        # Validate A2A response format
+        if not self.validate_a2a_response(response_msg, request_msg["id"]):
+            return None, "Invalid A2A response format"
+
+        # Check if request was successful
+        payload = response_msg["payload"]
+        if not payload["success"]:
+            error = payload.get("error", {})
+            return None, f"Service error: {error.get('message', 'Unknown error')}"
+
+        return payload, None
+
+    def extract_result(self, response_msg, request_msg, food_item):
+        """Validate an A2A response and unpack its (result, error) pair"""
+        payload, error = self.extract_payload(response_msg, request_msg)
+        if error:
+            return None, error
+
+        # Return the result
+        result = payload["result"]
+        logger.info("Received response for %s: %s", food_item, result['status'])
+
+        return result, None
+
+class ChickenFoodSafetyClient(BaseA2AClient):
+    def __init__(self, server_url="http://localhost:8080"):
+        """Initialize the A2A client"""
+        super().__init__(server_url)
+
+        # Reuse one pooled keep-alive session for every call to the server.
+        # Transient failures are retried inside the pool, honoring Retry-After;
+        # POST is safe to retry because food checks are read-only lookups.
+        self._session = requests.Session()
+        retries = Retry(
+            total=3,
+            connect=3,
+            read=2,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),
+            backoff_factor=0.2,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': f'{self.client_name}/{self.version}',
+            'Connection': 'keep-alive'
+        })
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def check_food_safety(self, food_item):
         """Send A2A request to check food safety for chickens"""
         try:
             # Create A2A request message
             request_msg = self.create_a2a_request(food_item)
 
-            logger.info(f"Sending A2A request for food item: {food_item}")
+            logger.info("Sending A2A request for food item: %s", food_item)
 
             # Send HTTPS request to server
-            response = requests.post(
+            response = self._session.post(
                 f"{self.server_url}/a2a/chicken-food-safety",
-                json=request_msg,
-                headers={
-                    'Content-Type': 'application/json',
-                    'User-Agent': f'{self.client_name}/{self.version}'
-                },
+                data=orjson.dumps(request_msg),
                 timeout=30
             )
 
             # Check HTTP status
             if response.status_code != 200:
-                logger.error(f"HTTP error: {response.status_code}")
+                logger.error("HTTP error: %s", response.status_code)
                 return None, f"Server error: {response.status_code}"
 
             # Parse A2A response
-            response_msg = response.json()
-
-            # Validate A2A response format
-            if not self.validate_a2a_response(response_msg, request_msg["id"]):
-                return None, "Invalid A2A response format"
+            response_msg = orjson.loads(response.content)
 
-            # Check if request was successful
-            if not response_msg["payload"]["success"]:
-                error = response_msg["payload"].get("error", {})
-                return None, f"Service error: {error.get('message', 'Unknown error')}"
-
-            # Return the result
-            result = response_msg["payload"]["result"]
-            logger.info(f"Received response for {food_item}: {result['status']}")
-
-            return result, None
+            return self.extract_result(response_msg, request_msg, food_item)
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Network error: {str(e)}")
+            logger.error("Network error: %s", e)
             return None, f"Network error: {str(e)}"
         except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {str(e)}")
+            logger.error("JSON decode error: %s", e)
             return None, f"Invalid JSON response: {str(e)}"
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+            logger.error("Unexpected error: %s", e)
             return None, f"Unexpected error: {str(e)}"
 
-    def validate_a2a_response(self, response_msg, request_id):
-        """Validate A2A response message format"""
-        required_fields = ["version", "id", "timestamp", "type", "payload"]
+    def check_food_safety_batch(self, foods):
+        """Check many food items, sending at most MAX_BATCH_SIZE per A2A batch request"""
+        foods = list(foods)
+        results = []
+        for start in range(0, len(foods), MAX_BATCH_SIZE):
+            chunk_results, error = self._post_batch(foods[start:start + MAX_BATCH_SIZE])
+            if error:
+                return None, error
+            results.extend(chunk_results)
+        return results, None
+
+    def _post_batch(self, foods):
+        """Check up to MAX_BATCH_SIZE food items with a single A2A batch request"""
+        try:
+            request_msg = self.create_a2a_batch_request(foods)
 
-        for field in required_fields:
-            if field not in response_msg:
-                logger.error(f"Missing required field in response: {field}")
-                return False
+            logger.info("Sending A2A batch request for %d food items", len(request_msg["payload"]["food_items"]))
 
-        if response_msg["type"] != "response":
-            logger.error("Response type must be 'response'")
-            return False
+            response = self._session.post(
+                f"{self.server_url}/a2a/chicken-food-safety/batch",
+                data=orjson.dumps(request_msg),
+                timeout=30
+            )
 
-        if response_msg.get("correlation_id") != request_id:
-            logger.error("Correlation ID mismatch")
-            return False
+            # Check HTTP status
+            if response.status_code != 200:
+                logger.error("HTTP error: %s", response.status_code)
+                return None, f"Server error: {response.status_code}"
 
-        if "success" not in response_msg["payload"]:
-            logger.error("Missing 'success' in response payload")
-            return False
+            # Parse A2A response
+            response_msg = orjson.loads(response.content)
 
-        return True
+            payload, error = self.extract_payload(response_msg, request_msg)
+            if error:
+                return None, error
+
+            return payload["results"], None
+
+        except requests.exceptions.RequestException as e:
+            logger.error("Network error: %s", e)
+            return None, f"Network error: {str(e)}"
+        except json.JSONDecodeError as e:
+            logger.error("JSON decode error: %s", e)
+            return None, f"Invalid JSON response: {str(e)}"
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            return None, f"Unexpected error: {str(e)}"
 
     def discover_services(self):
         """Discover available services on the server"""
         try:
-            response = requests.get(f"{self.server_url}/a2a/discovery", timeout=10)
+            response = self._session.get(f"{self.server_url}/a2a/discovery", timeout=10)
             if response.status_code == 200:
-                return response.json(), None
+                return orjson.loads(response.content), None
             else:
                 return None, f"Discovery failed: {response.status_code}"
         except Exception as e:
@@ -135,14 +262,87 @@ class ChickenFoodSafetyClient:
     def health_check(self):
         """Check server health"""
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=10)
+            response = self._session.get(f"{self.server_url}/health", timeout=10)
             if response.status_code == 200:
-                return response.json(), None
+                return orjson.loads(response.content), None
             else:
                 return None, f"Health check failed: {response.status_code}"
         except Exception as e:
             return None, f"Health check error: {str(e)}"
 
+class AsyncChickenFoodSafetyClient(BaseA2AClient):
+    def __init__(self, server_url="http://localhost:8080", max_concurrency=20):
+        """Initialize the asyncio A2A client"""
+        super().__init__(server_url)
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        # Create the session lazily so it binds to the running event loop
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={'User-Agent': f'{self.client_name}/{self.version}'}
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def check_food_safety(self, food_item):
+        """Send A2A request to check food safety for chickens"""
+        if self._session is None:
+            raise RuntimeError("AsyncChickenFoodSafetyClient must be used inside 'async with'")
+
+        try:
+            # Create A2A request message
+            request_msg = self.create_a2a_request(food_item)
+
+            logger.info("Sending A2A request for food item: %s", food_item)
+
+            async with self._semaphore:
+                async with self._session.post(
+                    f"{self.server_url}/a2a/chicken-food-safety",
+                    data=orjson.dumps(request_msg),
+                    headers={'Content-Type': 'application/json'}
+                ) as response:
+                    # Check HTTP status
+                    if response.status != 200:
+                        logger.error("HTTP error: %s", response.status)
+                        return None, f"Server error: {response.status}"
+
+                    # Parse A2A response
+                    response_msg = await response.json(loads=orjson.loads)
+
+            return self.extract_result(response_msg, request_msg, food_item)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Network error: %s", e)
+            return None, f"Network error: {str(e)}"
+        except json.JSONDecodeError as e:
+            logger.error("JSON decode error: %s", e)
+            return None, f"Invalid JSON response: {str(e)}"
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            return None, f"Unexpected error: {str(e)}"
+
+    async def check_many(self, foods):
+        """Check several food items concurrently, returning (result, error) pairs in order"""
+        return await asyncio.gather(*(self.check_food_safety(f) for f in foods))
+
+async def run_async_batch(server_url, foods):
+    """Check a batch of food items concurrently with the async client"""
+    async with AsyncChickenFoodSafetyClient(server_url) as client:
+        return await client.check_many(foods)
+
 def format_result(result):
     """Format the safety check result for display"""
     if result["is_safe"] is True:
@@ -170,71 +370,92 @@ def main():
                        help='Discover available services')
     parser.add_argument('--health', action='store_true',
                        help='Check server health')
+    parser.add_argument('--async-batch', action='store_true',
+                       help='Read food items from stdin (one per line) and check them concurrently')
 
     args = parser.parse_args()
 
-    client = ChickenFoodSafetyClient(args.server)
-
-    # Handle discovery request
-    if args.discover:
-        services, error = client.discover_services()
-        if error:
-            print(f"Error: {error}")
-            sys.exit(1)
-        print("Available Services:")
-        print(json.dumps(services, indent=2))
-        return
-
-    # Handle health check
-    if args.health:
-        health, error = client.health_check()
-        if error:
-            print(f"Error: {error}")
+    # Configure logging for the CLI only, so importing the client leaves the
+    # host application's logging alone
+    logging.basicConfig(level=logging.INFO)
+
+    # Handle concurrent batch check of foods read from stdin
+    if args.async_batch:
+        foods = [line.strip() for line in sys.stdin if line.strip()]
+        results = asyncio.run(run_async_batch(args.server, foods))
+        failed = False
+        for food_item, (result, error) in zip(foods, results):
+            if error:
+                failed = True
+                print(f"❌ Error checking {food_item}: {error}")
+            else:
+                print(format_result(result))
+        if failed:
             sys.exit(1)
-        print("Server Health:")
-        print(json.dumps(health, indent=2))
         return
 
-    # Handle food safety check
-    if args.food:
-        # Single food item check
-        result, error = client.check_food_safety(args.food)
-        if error:
-            print(f"Error: {error}")
-            sys.exit(1)
-        print(format_result(result))
-    else:
-        # Interactive mode
-        print("🐔 Chicken Food Safety Checker (A2A Client)")
-        print(f"Connected to: {args.server}")
-        print("Type food items to check their safety for chickens.")
-        print("Type 'quit' or 'exit' to stop.\n")
-
-        while True:
-            try:
-                food_item = input("Enter food item: ").strip()
-
-                if not food_item:
-                    continue
-
-                if food_item.lower() in ['quit', 'exit']:
-                    print("Goodbye!")
+    with ChickenFoodSafetyClient(args.server) as client:
+        # Handle discovery request
+        if args.discover:
+            services, error = client.discover_services()
+            if error:
+                print(f"Error: {error}")
+                sys.exit(1)
+            print("Available Services:")
+            print(json.dumps(services, indent=2))
+            return
+
+        # Handle health check
+        if args.health:
+            health, error = client.health_check()
+            if error:
+                print(f"Error: {error}")
+                sys.exit(1)
+            print("Server Health:")
+            print(json.dumps(health, indent=2))
+            return
+
+        # Handle food safety check
+        if args.food:
+            # Single food item check
+            result, error = client.check_food_safety(args.food)
+            if error:
+                print(f"Error: {error}")
+                sys.exit(1)
+            print(format_result(result))
+        else:
+            # Interactive mode
+            print("🐔 Chicken Food Safety Checker (A2A Client)")
+            print(f"Connected to: {args.server}")
+            print("Type food items to check their safety for chickens.")
+            print("Type 'quit' or 'exit' to stop.\n")
+
+            while True:
+                try:
+                    food_item = input("Enter food item: ").strip()
+
+                    if not food_item:
+                        continue
+
+                    if food_item.lower() in ['quit', 'exit']:
+                        print("Goodbye!")
+                        break
+
+                    result, error = client.check_food_safety(food_item)
+
+                    if error:
+                        print(f"❌ Error: {error}")
+                    else:
+                        print(format_result(result))
+
+                    print()  # Empty line for readability
+
+                except KeyboardInterrupt:
+                    print("\n\nGoodbye!")
                     break
+                except Exception as e:
+                    print(f"❌ Unexpected error: {e}")
 
-                result, error = client.check_food_safety(food_item)
-
-                if error:
-                    print(f"❌ Error: {error}")
-                else:
-                    print(format_result(result))
-
-                print()  # Empty line for readability
-
-            except KeyboardInterrupt:
-                print("\n\nGoodbye!")
-                break
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
 
 if __name__ == '__main__':
     main()
@@ -4,20 +4,116 @@ A2A Server for Chicken Food Safety Service
 Implements the standard Agent-to-Agent HTTPS protocol with JSON messaging
 """
 
+import functools
+import hashlib
+import itertools
 import json
-import uuid
+import os
+import queue
+import secrets
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from flask import Flask, request, jsonify
+from fastapi import FastAPI, Request, Response
+from brotli_asgi import BrotliMiddleware
+import fastjsonschema
+import orjson
+import structlog
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from .timestamps import iso_now
 
-app = Flask(__name__)
+# Configure logging: structlog renders each event as one JSON line, which is
+# handed to a queue and written to stderr by a background listener thread, so
+# request handlers never block on log I/O. Set A2A_LOG_LEVEL to change the level.
+# Nothing is installed at import, so importing the package (e.g. for the client)
+# leaves the host application's logging alone; the server configures it on startup.
+_log_listener = None
+_queue_handler = None
+
+def _env_log_level():
+    """Read A2A_LOG_LEVEL, falling back to INFO for unknown level names"""
+    level = logging.getLevelName(os.environ.get("A2A_LOG_LEVEL", "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+def configure_logging():
+    """Route server logs through a queue to a background stderr writer"""
+    global _log_listener, _queue_handler
+    if _log_listener is not None:
+        return
+
+    log_level = _env_log_level()
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = QueueListener(log_queue, logging.StreamHandler())
+
+    # Attach to the root logger directly rather than via basicConfig, which is
+    # a no-op when root already has a handler and would leave the queue unread
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(log_level)
+    _log_listener.start()
+
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.JSONRenderer(serializer=lambda obj, **kwargs: orjson.dumps(obj).decode())
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True
+    )
+
+def stop_logging():
+    """Flush queued log records and stop the background writer"""
+    global _log_listener, _queue_handler
+    if _log_listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _log_listener.stop()
+        _log_listener = None
+        _queue_handler = None
+
+logger = structlog.get_logger(__name__)
+
+# Successful requests are logged 1 in (LOG_SAMPLE_MASK + 1); errors always are
+LOG_SAMPLE_MASK = 63
+_request_counter = itertools.count()
+
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+@asynccontextmanager
+async def lifespan(app):
+    """Configure logging when a server process starts and flush it on shutdown"""
+    configure_logging()
+    yield
+    stop_logging()
+
+# The handlers take raw A2A messages, so the generated OpenAPI docs add nothing
+app = FastAPI(
+    title="Chicken Food Safety Service",
+    version="1.0",
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    lifespan=lifespan
+)
+
+# Compress larger responses (e.g. service discovery) with brotli, or gzip for
+# clients that don't accept br
+app.add_middleware(BrotliMiddleware, minimum_size=500, gzip_fallback=True)
+
+# Keep idle client connections open so pooled clients can reuse them. The
+# Connection header is left to the server, which knows whether it will close.
+KEEP_ALIVE_TIMEOUT = 75
+KEEP_ALIVE_HEADERS = {
+    'Keep-Alive': f'timeout={KEEP_ALIVE_TIMEOUT}'
+}
 
 # Chicken food safety database
-SAFE_FOODS = {
+SAFE_FOODS = frozenset(sys.intern(s) for s in {
     'corn', 'wheat', 'oats', 'barley', 'rice', 'quinoa', 'millet',
     'lettuce', 'spinach', 'kale', 'cabbage', 'broccoli', 'carrots',
     'peas', 'green beans', 'squash', 'pumpkin', 'cucumber',
@@ -25,21 +121,94 @@ SAFE_FOODS = {
     'apples', 'berries', 'grapes', 'melon', 'banana',
     'chicken feed', 'layer feed', 'scratch grains',
     'sunflower seeds', 'pumpkin seeds', 'herbs', 'clover'
-}
+})
 
-UNSAFE_FOODS = {
+UNSAFE_FOODS = frozenset(sys.intern(s) for s in {
     'chocolate', 'avocado', 'onions', 'garlic', 'mushrooms',
     'raw beans', 'raw potatoes', 'green tomatoes', 'rhubarb',
     'apple seeds', 'cherry pits', 'caffeine', 'alcohol',
     'moldy food', 'salty snacks', 'candy', 'processed food'
+})
+
+# Single lookup table built once at import: casefolded food -> (is_safe, status).
+# Keys are interned so lookups with an interned key can match on identity, and
+# the table is never mutated, keeping its pages shared across forked workers.
+_FOOD_STATUS = (
+    {sys.intern(food.casefold()): (True, "safe") for food in SAFE_FOODS}
+    | {sys.intern(food.casefold()): (False, "unsafe") for food in UNSAFE_FOODS}
+)
+
+# A2A request schema, compiled once into a straight-line validator
+REQUEST_SCHEMA = {
+    "type": "object",
+    "required": ["version", "id", "timestamp", "type", "sender", "payload"],
+    "properties": {
+        "type": {"const": "request"},
+        "payload": {
+            "type": "object",
+            "required": ["service", "food_item"],
+            "properties": {
+                "service": {"const": "chicken_food_safety_check"},
+                "food_item": {"type": "string"}
+            }
+        }
+    }
+}
+
+_validate_request = fastjsonschema.compile(REQUEST_SCHEMA)
+
+# Upper bound on the number of food items accepted by one batch request
+MAX_BATCH_SIZE = 1000
+
+BATCH_REQUEST_SCHEMA = {
+    "type": "object",
+    "required": ["version", "id", "timestamp", "type", "sender", "payload"],
+    "properties": {
+        "type": {"const": "request"},
+        "payload": {
+            "type": "object",
+            "required": ["service", "food_items"],
+            "properties": {
+                "service": {"const": "chicken_food_safety_batch_check"},
+                "food_items": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "maxItems": MAX_BATCH_SIZE
+                }
+            }
+        }
+    }
 }
 
-def create_a2a_response(request_msg, success=True, result=None, error=None):
+_validate_batch_request = fastjsonschema.compile(BATCH_REQUEST_SCHEMA)
+
+_SAFE_MESSAGE = "{} is safe for chickens to eat."
+_UNSAFE_MESSAGE = "{} is NOT safe for chickens and should be avoided."
+_UNKNOWN_MESSAGE = "Safety information for {} is not available. Please consult a veterinarian."
+
+def json_response(content, status_code=200, headers=None):
+    """Serialize content with orjson into a keep-alive JSON response"""
+    return Response(
+        orjson.dumps(content, option=ORJSON_OPTIONS),
+        status_code=status_code,
+        media_type='application/json',
+        headers={**KEEP_ALIVE_HEADERS, **(headers or {})}
+    )
+
+def is_json_request(request):
+    """Check whether the request declares a JSON body"""
+    mimetype = request.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    return mimetype == 'application/json' or (
+        mimetype.startswith('application/') and mimetype.endswith('+json')
+    )
+
+def create_a2a_response(request_msg, success=True, result=None, error=None,
+                        service="chicken_food_safety_check"):
     """Create a standard A2A JSON response message"""
     response = {
         "version": "1.0",
-        "id": str(uuid.uuid4()),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "id": secrets.token_hex(16),
+        "timestamp": iso_now(),
         "type": "response",
         "correlation_id": request_msg.get("id"),
         "sender": {
@@ -50,7 +219,7 @@ def create_a2a_response(request_msg, success=True, result=None, error=None):
         "recipient": request_msg.get("sender", {}),
         "payload": {
             "success": success,
-            "service": "chicken_food_safety_check"
+            "service": service
         }
     }
 
@@ -63,73 +232,65 @@ def create_a2a_response(request_msg, success=True, result=None, error=None):
 
 def validate_a2a_request(msg):
     """Validate A2A request message format"""
-    required_fields = ["version", "id", "timestamp", "type", "sender", "payload"]
-
-    for field in required_fields:
-        if field not in msg:
-            return False, f"Missing required field: {field}"
-
-    if msg["type"] != "request":
-        return False, "Message type must be 'request'"
-
-    if "service" not in msg["payload"]:
-        return False, "Missing 'service' in payload"
-
-    if msg["payload"]["service"] != "chicken_food_safety_check":
-        return False, "Unknown service requested"
+    try:
+        _validate_request(msg)
+        return True, None
+    except fastjsonschema.JsonSchemaException as e:
+        return False, e.message
 
-    if "food_item" not in msg["payload"]:
-        return False, "Missing 'food_item' in payload"
+def validate_a2a_batch_request(msg):
+    """Validate A2A batch request message format"""
+    try:
+        _validate_batch_request(msg)
+        return True, None
+    except fastjsonschema.JsonSchemaException as e:
+        return False, e.message
 
-    return True, None
+@functools.lru_cache(maxsize=2048)
+def _classify(food_key):
+    """Return (is_safe, status, message_template) for a normalized food name"""
+    entry = _FOOD_STATUS.get(food_key)
+    if entry is None:
+        return None, "unknown", _UNKNOWN_MESSAGE
+    is_safe, status = entry
+    return is_safe, status, _SAFE_MESSAGE if is_safe else _UNSAFE_MESSAGE
 
 def check_food_safety(food_item):
     """Check if a food item is safe for chickens"""
-    food_lower = food_item.lower().strip()
-
-    if food_lower in SAFE_FOODS:
-        return {
-            "food_item": food_item,
-            "is_safe": True,
-            "status": "safe",
-            "message": f"{food_item} is safe for chickens to eat."
-        }
-    elif food_lower in UNSAFE_FOODS:
-        return {
-            "food_item": food_item,
-            "is_safe": False,
-            "status": "unsafe",
-            "message": f"{food_item} is NOT safe for chickens and should be avoided."
-        }
-    else:
-        return {
-            "food_item": food_item,
-            "is_safe": None,
-            "status": "unknown",
-            "message": f"Safety information for {food_item} is not available. Please consult a veterinarian."
-        }
+    is_safe, status, template = _classify(sys.intern(food_item.casefold().strip()))
+
+    return {
+        "food_item": food_item,
+        "is_safe": is_safe,
+        "status": status,
+        "message": template.format(food_item)
+    }
 
-@app.route('/a2a/chicken-food-safety', methods=['POST'])
-def chicken_food_safety():
+@app.post('/a2a/chicken-food-safety')
+async def chicken_food_safety(request: Request):
     """A2A endpoint for chicken food safety checks"""
     try:
         # Parse JSON request
-        if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 400
+        if not is_json_request(request):
+            return json_response({"error": "Content-Type must be application/json"}, 400)
 
-        request_msg = request.get_json()
-        logger.info(f"Received A2A request: {request_msg.get('id')}")
-
-        # Validate A2A message format
-        is_valid, error_msg = validate_a2a_request(request_msg)
+        # Validate A2A message format; a malformed body is a client error too
+        try:
+            request_msg = orjson.loads(await request.body())
+            is_valid, error_msg = validate_a2a_request(request_msg)
+        except orjson.JSONDecodeError as e:
+            request_msg, is_valid, error_msg = {}, False, f"Invalid JSON: {e}"
         if not is_valid:
-            logger.warning(f"Invalid A2A request: {error_msg}")
+            # A non-object body has no id or sender to echo back
+            if not isinstance(request_msg, dict):
+                request_msg = {}
+            logger.warning("invalid_a2a_request", request_id=request_msg.get('id'), error=error_msg)
             response = create_a2a_response(
                 request_msg,
                 success=False,
                 error={"code": "INVALID_REQUEST", "message": error_msg}
             )
-            return jsonify(response), 400
+            return json_response(response, 400)
 
         # Extract food item from payload
         food_item = request_msg["payload"]["food_item"]
@@ -140,61 +301,177 @@ def chicken_food_safety():
         # Create A2A response
         response = create_a2a_response(request_msg, success=True, result=result)
 
-        logger.info(f"Processed food safety check for '{food_item}': {result['status']}")
+        if next(_request_counter) & LOG_SAMPLE_MASK == 0:
+            logger.info(
+                "food_safety_check",
+                request_id=request_msg["id"],
+                food_item=food_item,
+                status=result['status']
+            )
 
-        return jsonify(response), 200
+        return json_response(response)
 
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
+        logger.error("request_failed", error=str(e))
         response = create_a2a_response(
             request_msg if 'request_msg' in locals() else {},
             success=False,
             error={"code": "INTERNAL_ERROR", "message": "Internal server error"}
         )
-        return jsonify(response), 500
+        return json_response(response, 500)
+
+@app.post('/a2a/chicken-food-safety/batch')
+async def chicken_food_safety_batch(request: Request):
+    """A2A endpoint for checking many food items in one request"""
+    service = "chicken_food_safety_batch_check"
+    try:
+        # Parse JSON request
+        if not is_json_request(request):
+            return json_response({"error": "Content-Type must be application/json"}, 400)
+
+        # Validate A2A message format; a malformed body is a client error too
+        try:
+            request_msg = orjson.loads(await request.body())
+            is_valid, error_msg = validate_a2a_batch_request(request_msg)
+        except orjson.JSONDecodeError as e:
+            request_msg, is_valid, error_msg = {}, False, f"Invalid JSON: {e}"
+        if not is_valid:
+            # A non-object body has no id or sender to echo back
+            if not isinstance(request_msg, dict):
+                request_msg = {}
+            logger.warning("invalid_a2a_batch_request", request_id=request_msg.get('id'), error=error_msg)
+            response = create_a2a_response(
+                request_msg,
+                success=False,
+                error={"code": "INVALID_REQUEST", "message": error_msg},
+                service=service
+            )
+            return json_response(response, 400)
+
+        # Check every food item in the payload
+        food_items = request_msg["payload"]["food_items"]
+        results = [check_food_safety(food_item) for food_item in food_items]
+
+        # Create A2A response
+        response = create_a2a_response(request_msg, success=True, service=service)
+        response["payload"]["results"] = results
+
+        if next(_request_counter) & LOG_SAMPLE_MASK == 0:
+            logger.info("food_safety_batch_check", request_id=request_msg["id"], items=len(results))
 
-@app.route('/health', methods=['GET'])
-def health_check():
+        return json_response(response)
+
+    except Exception as e:
+        logger.error("batch_request_failed", error=str(e))
+        response = create_a2a_response(
+            request_msg if 'request_msg' in locals() else {},
+            success=False,
+            error={"code": "INTERNAL_ERROR", "message": "Internal server error"},
+            service=service
+        )
+        return json_response(response, 500)
+
+# Static payloads are serialized once at import instead of on every request.
+# The discovery ETag is weak because the body may be sent br/gzip-encoded.
+_HEALTH_BASE = {
+    "status": "healthy",
+    "service": "chicken-food-safety-service",
+    "version": "1.0"
+}
+
+_DISCOVERY_BYTES = orjson.dumps({
+    "services": [
+        {
+            "name": "chicken_food_safety_check",
+            "description": "Check if a food item is safe for chickens",
+            "endpoint": "/a2a/chicken-food-safety",
+            "method": "POST",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "food_item": {
+                        "type": "string",
+                        "description": "Name of the food item to check"
+                    }
+                },
+                "required": ["food_item"]
+            }
+        },
+        {
+            "name": "chicken_food_safety_batch_check",
+            "description": f"Check up to {MAX_BATCH_SIZE} food items in a single request",
+            "endpoint": "/a2a/chicken-food-safety/batch",
+            "method": "POST",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "food_items": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "maxItems": MAX_BATCH_SIZE,
+                        "description": "Names of the food items to check"
+                    }
+                },
+                "required": ["food_items"]
+            }
+        }
+    ]
+})
+_DISCOVERY_ETAG = hashlib.md5(_DISCOVERY_BYTES, usedforsecurity=False).hexdigest()
+_DISCOVERY_HEADERS = {
+    **KEEP_ALIVE_HEADERS,
+    'Cache-Control': 'public, max-age=300',
+    'ETag': f'W/"{_DISCOVERY_ETAG}"'
+}
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header value against an unquoted ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+@app.api_route('/health', methods=['GET', 'HEAD'])
+async def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "service": "chicken-food-safety-service",
-        "version": "1.0",
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
+    return json_response({**_HEALTH_BASE, "timestamp": datetime.now(timezone.utc)})
 
-@app.route('/a2a/discovery', methods=['GET'])
-def service_discovery():
+@app.api_route('/a2a/discovery', methods=['GET', 'HEAD'])
+async def service_discovery(request: Request):
     """A2A service discovery endpoint"""
-    return jsonify({
-        "services": [
-            {
-                "name": "chicken_food_safety_check",
-                "description": "Check if a food item is safe for chickens",
-                "endpoint": "/a2a/chicken-food-safety",
-                "method": "POST",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "food_item": {
-                            "type": "string",
-                            "description": "Name of the food item to check"
-                        }
-                    },
-                    "required": ["food_item"]
-                }
-            }
-        ]
-    })
+    if etag_matches(request.headers.get('if-none-match', ''), _DISCOVERY_ETAG):
+        return Response(status_code=304, headers=_DISCOVERY_HEADERS)
+    return Response(_DISCOVERY_BYTES, media_type='application/json', headers=_DISCOVERY_HEADERS)
 
 def main():
     print("Starting Chicken Food Safety A2A Server...")
     print("Endpoints:")
     print("  POST /a2a/chicken-food-safety - Main A2A service endpoint")
+    print("  POST /a2a/chicken-food-safety/batch - Batch A2A service endpoint")
     print("  GET  /health - Health check")
     print("  GET  /a2a/discovery - Service discovery")
 
-    app.run(host='0.0.0.0', port=8080, debug=True)
+    # Hand the process over to Gunicorn: one Uvicorn worker per process
+    # sidesteps the GIL, and the food tables are read-only so sharing the
+    # imported module across forked workers is safe.
+    workers = 2 * (os.cpu_count() or 1) + 1
+    # execv replaces the process without flushing stdio buffers, which would
+    # drop the banner when stdout is a pipe or file
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(sys.executable, [
+        sys.executable, "-m", "gunicorn",
+        "-w", str(workers),
+        "-k", "uvicorn_worker.UvicornWorker",
+        "--keep-alive", str(KEEP_ALIVE_TIMEOUT),
+        "--bind", "0.0.0.0:8080",
+        "a2a_chicken_food_safety.server:app"
+    ])
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,19 @@
+"""
+Timestamp helpers for A2A messages
+"""
+
+import time
+from datetime import datetime, timezone
+
+# (second, formatted timestamp) for the most recent wall-clock second
+_ts_cache = (None, "")
+
+def iso_now():
+    """Return the current UTC time as an ISO 8601 string, cached per second"""
+    global _ts_cache
+    second = int(time.time())
+    cached_second, cached_value = _ts_cache
+    if second != cached_second:
+        cached_value = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        _ts_cache = (second, cached_value)
+    return cached_value
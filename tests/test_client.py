@@ -0,0 +1,157 @@
+"""
+Tests for the A2A Chicken Food Safety clients
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+import pytest
+import urllib3.util.retry
+from fastapi.testclient import TestClient
+
+from a2a_chicken_food_safety import client as client_module
+from a2a_chicken_food_safety.client import AsyncChickenFoodSafetyClient, ChickenFoodSafetyClient
+from a2a_chicken_food_safety.server import app
+
+
+class AppSession:
+    """Stands in for the client's requests.Session, routing posts to the app"""
+
+    def __init__(self):
+        self._client = TestClient(app)
+        self.posts = 0
+
+    def post(self, url, data, timeout):
+        self.posts += 1
+        return self._client.post(url, content=data, headers={"Content-Type": "application/json"})
+
+    def close(self):
+        self._client.close()
+
+
+@pytest.fixture
+def sync_client():
+    a2a_client = ChickenFoodSafetyClient("http://testserver")
+    a2a_client._session.close()
+    a2a_client._session = AppSession()
+    yield a2a_client
+    a2a_client.close()
+
+
+def test_async_client_requires_context_manager():
+    client = AsyncChickenFoodSafetyClient()
+
+    with pytest.raises(RuntimeError, match="async with"):
+        asyncio.run(client.check_food_safety("corn"))
+
+
+def test_extract_payload_reports_service_and_format_errors():
+    client = AsyncChickenFoodSafetyClient()
+    request_msg = client.create_a2a_batch_request(["corn"])
+    response_msg = {
+        "version": "1.0",
+        "id": "abc",
+        "timestamp": "2026-01-01T00:00:00Z",
+        "type": "response",
+        "correlation_id": request_msg["id"],
+        "payload": {"success": False, "error": {"message": "boom"}}
+    }
+
+    assert client.extract_payload(response_msg, request_msg) == (None, "Service error: boom")
+
+    response_msg["correlation_id"] = "other"
+    assert client.extract_payload(response_msg, request_msg) == (None, "Invalid A2A response format")
+
+
+def test_batch_check_against_server(sync_client):
+    results, error = sync_client.check_food_safety_batch(["corn", "chocolate", "rocks"])
+
+    assert error is None
+    assert [r["status"] for r in results] == ["safe", "unsafe", "unknown"]
+
+
+def test_batch_check_splits_at_server_limit(sync_client):
+    foods = ["corn"] * (2 * client_module.MAX_BATCH_SIZE + 1)
+    results, error = sync_client.check_food_safety_batch(foods)
+
+    assert error is None
+    assert len(results) == len(foods)
+    assert sync_client._session.posts == 3
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers with queued error statuses, then with a valid A2A response"""
+
+    statuses = []
+    attempts = 0
+
+    def do_POST(self):
+        type(self).attempts += 1
+        request_msg = orjson.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 200:
+            body = orjson.dumps({
+                "version": "1.0",
+                "id": "stub",
+                "timestamp": "2026-01-01T00:00:00Z",
+                "type": "response",
+                "correlation_id": request_msg["id"],
+                "payload": {
+                    "success": True,
+                    "result": {"food_item": "corn", "is_safe": True, "status": "safe", "message": "ok"}
+                }
+            })
+        else:
+            body = b"{}"
+        self.send_response(status)
+        if status != 200:
+            self.send_header("Retry-After", "2")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(urllib3.util.retry.time, "sleep", sleeps.append)
+    FlakyHandler.statuses = []
+    FlakyHandler.attempts = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", sleeps
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retries_transient_status_honoring_retry_after(flaky_server, status):
+    url, sleeps = flaky_server
+    FlakyHandler.statuses = [status]
+
+    with ChickenFoodSafetyClient(url) as a2a_client:
+        result, error = a2a_client.check_food_safety("corn")
+
+    assert error is None
+    assert result["status"] == "safe"
+    assert FlakyHandler.attempts == 2
+    assert sleeps == [2]
+
+
+def test_returns_server_error_once_retries_run_out(flaky_server):
+    url, sleeps = flaky_server
+    FlakyHandler.statuses = [503] * 10
+
+    with ChickenFoodSafetyClient(url) as a2a_client:
+        result, error = a2a_client.check_food_safety("corn")
+
+    assert result is None
+    assert error == "Server error: 503"
+    assert FlakyHandler.attempts == 4
@@ -0,0 +1,173 @@
+"""
+Tests for the A2A Chicken Food Safety server endpoints
+"""
+
+import logging
+import os
+import subprocess
+import sys
+from logging.handlers import QueueHandler
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_chicken_food_safety.client import ChickenFoodSafetyClient
+from a2a_chicken_food_safety.server import _env_log_level, app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def a2a():
+    """A client used only to build well-formed A2A request messages"""
+    a2a_client = ChickenFoodSafetyClient()
+    yield a2a_client
+    a2a_client.close()
+
+
+def test_check_safe_food(client, a2a):
+    msg = a2a.create_a2a_request("Corn")
+    response = client.post("/a2a/chicken-food-safety", json=msg)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["type"] == "response"
+    assert body["correlation_id"] == msg["id"]
+    assert body["payload"]["success"] is True
+    assert body["payload"]["result"] == {
+        "food_item": "Corn",
+        "is_safe": True,
+        "status": "safe",
+        "message": "Corn is safe for chickens to eat."
+    }
+
+
+def test_check_unsafe_and_unknown_food(client, a2a):
+    unsafe = client.post("/a2a/chicken-food-safety", json=a2a.create_a2a_request("chocolate"))
+    unknown = client.post("/a2a/chicken-food-safety", json=a2a.create_a2a_request("rocks"))
+
+    assert unsafe.json()["payload"]["result"]["status"] == "unsafe"
+    assert unknown.json()["payload"]["result"]["is_safe"] is None
+    assert unknown.json()["payload"]["result"]["status"] == "unknown"
+
+
+def test_batch_check(client, a2a):
+    msg = a2a.create_a2a_batch_request(["corn", "chocolate", "rocks"])
+    response = client.post("/a2a/chicken-food-safety/batch", json=msg)
+
+    assert response.status_code == 200
+    payload = response.json()["payload"]
+    assert payload["success"] is True
+    assert payload["service"] == "chicken_food_safety_batch_check"
+    assert [r["status"] for r in payload["results"]] == ["safe", "unsafe", "unknown"]
+
+
+def test_invalid_request_returns_a2a_error(client, a2a):
+    msg = a2a.create_a2a_request("corn")
+    del msg["sender"]
+    response = client.post("/a2a/chicken-food-safety", json=msg)
+
+    assert response.status_code == 400
+    body = response.json()
+    assert body["correlation_id"] == msg["id"]
+    assert body["payload"]["success"] is False
+    assert body["payload"]["error"]["code"] == "INVALID_REQUEST"
+
+
+def test_non_string_food_item_rejected(client, a2a):
+    response = client.post("/a2a/chicken-food-safety", json=a2a.create_a2a_request(5))
+
+    assert response.status_code == 400
+    assert response.json()["payload"]["error"]["code"] == "INVALID_REQUEST"
+
+
+@pytest.mark.parametrize("path", ["/a2a/chicken-food-safety", "/a2a/chicken-food-safety/batch"])
+@pytest.mark.parametrize("body", [b"[]", b'"corn"', b"{bad"])
+def test_non_object_body_returns_a2a_error(client, path, body):
+    response = client.post(path, content=body, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+    body = response.json()
+    assert body["correlation_id"] is None
+    assert body["payload"]["error"]["code"] == "INVALID_REQUEST"
+
+
+def test_non_json_content_type_rejected(client):
+    response = client.post(
+        "/a2a/chicken-food-safety",
+        content="corn",
+        headers={"Content-Type": "text/plain"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_discovery_not_modified(client):
+    first = client.get("/a2a/discovery")
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+    names = [service["name"] for service in first.json()["services"]]
+    assert names == ["chicken_food_safety_check", "chicken_food_safety_batch_check"]
+
+    second = client.get("/a2a/discovery", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_health(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert "timestamp" in response.json()
+    assert client.head("/health").status_code == 200
+
+
+def test_discovery_head(client):
+    response = client.head("/a2a/discovery")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == client.get("/a2a/discovery").headers["ETag"]
+    assert response.content == b""
+
+
+def test_docs_routes_disabled(client):
+    assert client.get("/docs").status_code == 404
+    assert client.get("/openapi.json").status_code == 404
+
+
+def test_keep_alive_header_is_advertised(client):
+    response = client.get("/health")
+
+    assert response.headers["Keep-Alive"] == "timeout=75"
+
+
+def test_import_leaves_logging_alone():
+    # Run in a fresh interpreter: pytest installs its own root handlers
+    code = (
+        "import logging, threading, structlog, a2a_chicken_food_safety;"
+        "assert not logging.getLogger().handlers;"
+        "assert not structlog.is_configured();"
+        "assert threading.active_count() == 1"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "A2A_LOG_LEVEL": "verbose"})
+
+
+def test_logging_survives_lifespan_restart(capfd):
+    for _ in range(2):
+        with TestClient(app) as client:
+            client.post("/a2a/chicken-food-safety", json=[])
+        assert "invalid_a2a_request" in capfd.readouterr().err
+
+    assert not any(isinstance(h, QueueHandler) for h in logging.getLogger().handlers)
+
+
+def test_unknown_log_level_falls_back_to_info(monkeypatch):
+    monkeypatch.setenv("A2A_LOG_LEVEL", "verbose")
+    assert _env_log_level() == logging.INFO
+
+    monkeypatch.setenv("A2A_LOG_LEVEL", "debug")
+    assert _env_log_level() == logging.DEBUG